@@ -17,32 +17,30 @@ from test_framework.test_framework import BitcoinTestFramework
 from test_framework.qtum import *
 from test_framework.blocktools import *
 from test_framework.key import *
-import io
 import time
 
+ADDR_DGP = "0000000000000000000000000000000000000091"
+ADDR_ORACLE = "0000000000000000000000000000000000000092"
+
 class DgpTest(BitcoinTestFramework):
     def set_test_params(self):
         self.setup_clean_chain = False
         self.num_nodes = 1
 
     def collect_staking_prevouts(self):
-        blocks = []
-        for block_number in range(self.node.getblockcount()):
-            block_hash = self.node.getblockhash(block_number)
-            blocks.append(self.node.getblock(block_hash))
+        block_hashes = self.node.batch([["getblockhash", block_number] for block_number in range(self.node.getblockcount() + 1)])
+        blocks = self.node.batch([["getblock", block_hash] for block_hash in block_hashes])
 
-        staking_prevouts = []
+        txid_to_time = {}
+        for block in blocks:
+            for txid in block['tx']:
+                txid_to_time[txid] = block['time']
 
-        for unspent in self.node.listunspent():
-            for block in blocks:
-                if unspent['txid'] in block['tx']:
-                    tx_block_time = block['time']
-                    break
-            else:
-                assert(False)
+        staking_prevouts = []
 
-            if unspent['confirmations'] > COINBASE_MATURITY:
-                staking_prevouts.append((COutPoint(int(unspent['txid'], 16), unspent['vout']), int(unspent['amount'])*COIN, tx_block_time))
+        for unspent in self.node.listunspent(COINBASE_MATURITY + 1):
+            tx_block_time = txid_to_time[unspent['txid']]
+            staking_prevouts.append((COutPoint(int(unspent['txid'], 16), unspent['vout']), int(unspent['amount'])*COIN, tx_block_time))
 
         return staking_prevouts
 
@@ -54,10 +52,7 @@ class DgpTest(BitcoinTestFramework):
 
         #print('node.getbestblockhash node=%s' % (tip))
         parent_block_stake_modifier = int(tip['modifier'], 16)
-        coinbase = create_coinbase(tip['height']+1)
-        coinbase.vout[0].nValue = 0
-        coinbase.vout[0].scriptPubKey = b""
-        coinbase.rehash()
+        coinbase = make_empty_pos_coinbase(tip['height']+1)
         block = create_block(int(tip['hash'], 16), coinbase, nTime, nCounter=nCounter)
         block.hashStateRoot = int(tip['hashStateRoot'], 16)
         block.hashUTXORoot = int(tip['hashUTXORoot'], 16)
@@ -87,9 +82,7 @@ class DgpTest(BitcoinTestFramework):
 
         stake_tx_signed_raw_hex = node.signrawtransaction(bytes_to_hex_str(stake_tx_unsigned.serialize()))['hex']
         #print('stake_tx_unsigned.vout=%s' % (stake_tx_unsigned.vout))
-        f = io.BytesIO(hex_str_to_bytes(stake_tx_signed_raw_hex))
-        stake_tx_signed = CTransaction()
-        stake_tx_signed.deserialize(f)
+        stake_tx_signed = FromHex(CTransaction(), stake_tx_signed_raw_hex)
         block.vtx.append(stake_tx_signed)
         block.hashMerkleRoot = block.calc_merkle_root()
         return (block, block_sig_key)
@@ -103,53 +96,46 @@ class DgpTest(BitcoinTestFramework):
 
         self.node.setmocktime(int(time.time()))
 
-        CALLSTRING_CHAR_COUNT = 64
-
         # 1. Get admin addresses
-        main_address = self.nodes[0].getnewaddress()
-        backup_address = self.nodes[0].getnewaddress()
-        main_address_eth = self.nodes[0].gethexaddress(main_address)
-        backup_address_eth = self.nodes[0].gethexaddress(backup_address)
+        (main_address, main_address_eth), (backup_address, backup_address_eth) = new_hex_pairs(self.nodes[0], 2)
 
         self.nodes[0].sendtoaddress(main_address, 100)
 
         # 2. Set initial admin for DGP and Oracle
 
-        callstring = ("7fd05e2a" +
-                      "000000000000000000000000" + main_address_eth +
-                      "000000000000000000000000" + backup_address_eth)
+        callstring = dgp_init_admin_callstring(main_address_eth, backup_address_eth)
 
-        self.nodes[0].sendtocontract("0000000000000000000000000000000000000091", callstring)
-        self.nodes[0].sendtocontract("0000000000000000000000000000000000000092", callstring)
+        self.nodes[0].sendtocontract(ADDR_DGP, callstring)
+        self.nodes[0].sendtocontract(ADDR_ORACLE, callstring)
 
         # 3. Set oracle address in DGP
 
-        callstring = ("7adbf973" + "000000000000000000000000" + "0000000000000000000000000000000000000092")
-        self.nodes[0].sendtocontract("0000000000000000000000000000000000000091", callstring, 0, 2500000, main_address)
+        callstring = ("7adbf973" + "000000000000000000000000" + ADDR_ORACLE)
+        self.nodes[0].sendtocontract(ADDR_DGP, callstring, 0, 2500000, main_address)
 
         # 4. Set DGP address in oracle
 
-        callstring = ("85d5f882" + "000000000000000000000000" + "0000000000000000000000000000000000000091")
-        self.nodes[0].sendtocontract("0000000000000000000000000000000000000092", callstring, 0, 2500000, main_address)
+        callstring = ("85d5f882" + "000000000000000000000000" + ADDR_DGP)
+        self.nodes[0].sendtocontract(ADDR_ORACLE, callstring, 0, 2500000, main_address)
 
         self.nodes[0].generate(1)
 
         # 4. Create some sample vote callstring
         createvote_callstring = ("70eb3901" +
-                                 "0" * (CALLSTRING_CHAR_COUNT - len(format(3, 'x'))) + format(3, 'x') +   # Burn rate param
-                                 "0" * (CALLSTRING_CHAR_COUNT - len(format(33, 'x'))) + format(33, 'x') + # Param value
-                                 "0" * (CALLSTRING_CHAR_COUNT - len(format(13, 'x'))) + format(3, 'x'))  # Vote duration
+                                 abi_uint(3) +     # Burn rate param
+                                 abi_uint(33) +    # Param value
+                                 abi_uint(3))      # Vote duration
 
         # 5. Create vote
-        self.nodes[0].sendtocontract("0000000000000000000000000000000000000091", createvote_callstring, 0, 2500000, main_address)
+        self.nodes[0].sendtocontract(ADDR_DGP, createvote_callstring, 0, 2500000, main_address)
 
         self.nodes[0].generate(1)
 
-        vote_for_callstring = "4b9f5c98" + "000000000000000000000000000000000000000000000000000000000000000" + "1" # vote for
-        vote_against_callstring = "4b9f5c98" + "000000000000000000000000000000000000000000000000000000000000000" + "0" # vote against
+        vote_for_callstring = "4b9f5c98" + abi_uint(1) # vote for
+        vote_against_callstring = "4b9f5c98" + abi_uint(0) # vote against
 
-        self.nodes[0].sendtocontract("0000000000000000000000000000000000000091", vote_for_callstring, 11, 2500000, main_address)
-        self.nodes[0].sendtocontract("0000000000000000000000000000000000000091", vote_against_callstring, 10, 2500000, main_address)
+        self.nodes[0].sendtocontract(ADDR_DGP, vote_for_callstring, 11, 2500000, main_address)
+        self.nodes[0].sendtocontract(ADDR_DGP, vote_against_callstring, 10, 2500000, main_address)
 
         self.nodes[0].generate(2)
 
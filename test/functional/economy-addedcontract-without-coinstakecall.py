@@ -10,46 +10,14 @@ It will perform a check that if a contract is added to block, but
 Economy AddContract is not called in coinstake, the block shall not be accepted
 """
 
-from collections import defaultdict
-
 # Avoid wildcard * imports if possible
 from test_framework.test_framework import BitcoinTestFramework
 from test_framework.qtum import *
 from test_framework.blocktools import *
 from test_framework.key import *
-import io
+from test_framework.dgp_base_node import BaseNode
 import time
 
-# NodeConnCB is a class containing callbacks to be executed when a P2P
-# message is received from the node-under-test. Subclass NodeConnCB and
-# override the on_*() methods if you need custom behaviour.
-class BaseNode(NodeConnCB):
-    def __init__(self):
-        """Initialize the NodeConnCB
-
-        Used to inialize custom properties for the Node that aren't
-        included by default in the base class. Be aware that the NodeConnCB
-        base class already stores a counter for each P2P message type and the
-        last received message of each type, which should be sufficient for the
-        needs of most tests.
-
-        Call super().__init__() first for standard initialization and then
-        initialize custom properties."""
-        super().__init__()
-        # Stores a dictionary of all blocks received
-        self.block_receive_map = defaultdict(int)
-
-    def on_block(self, conn, message):
-        """Override the standard on_block callback
-
-        Store the hash of a received block in the dictionary."""
-        message.block.calc_sha256()
-        self.block_receive_map[message.block.sha256] += 1
-
-    def on_inv(self, conn, message):
-        """Override the standard on_inv callback"""
-        pass
-
 class EconomyTest(BitcoinTestFramework):
 
     def set_test_params(self):
@@ -60,30 +28,18 @@ class EconomyTest(BitcoinTestFramework):
         self.num_nodes = 1
         self.extra_args = [[]]
 
-    def create_unsigned_pos_block(self, staking_prevouts, nTime):
-
-        best_block_hash = self.nodes[0].getbestblockhash()
-        block_height = self.nodes[0].getblockcount()
+    def create_unsigned_pos_block(self, staking_prevouts, nTime, tip):
+        best_block_hash = tip['hash']
+        block_height = tip['height']
 
-        parent_block_stake_modifier = int(self.nodes[0].getblock(best_block_hash)['modifier'], 16)
-        parent_block_raw_hex = self.nodes[0].getblock(best_block_hash, False)
-        f = io.BytesIO(hex_str_to_bytes(parent_block_raw_hex))
-        parent_block = CBlock()
-        parent_block.deserialize(f)
-        coinbase = create_coinbase(block_height+1)
-        coinbase.vout[0].nValue = 0
-        coinbase.vout[0].scriptPubKey = b""
-        coinbase.rehash()
+        parent_block_stake_modifier = int(tip['modifier'], 16)
+        coinbase = make_empty_pos_coinbase(block_height+1)
         block = create_block(int(best_block_hash, 16), coinbase, nTime)
         block.hashPrevBlock = int(best_block_hash, 16)
         if not block.solve_stake(parent_block_stake_modifier, staking_prevouts):
             return None
 
-        # create a new private key used for block signing.
-        block_sig_key = CECKey()
-        block_sig_key.set_secretbytes(hash256(struct.pack('<I', 0xffff)))
-        pubkey = block_sig_key.get_pubkey()
-        scriptPubKey = CScript([pubkey, OP_CHECKSIG])
+        block_sig_key, scriptPubKey = fixed_block_sig_key()
         stake_tx_unsigned = CTransaction()
         coinstake_prevout = block.prevoutStake
 
@@ -93,9 +49,7 @@ class EconomyTest(BitcoinTestFramework):
         stake_tx_unsigned.vout.append(CTxOut(int(96268640), scriptPubKey))
 
         stake_tx_signed_raw_hex = self.nodes[0].signrawtransaction(bytes_to_hex_str(stake_tx_unsigned.serialize()))['hex']
-        f = io.BytesIO(hex_str_to_bytes(stake_tx_signed_raw_hex))
-        stake_tx_signed = CTransaction()
-        stake_tx_signed.deserialize(f)
+        stake_tx_signed = FromHex(CTransaction(), stake_tx_signed_raw_hex)
         block.vtx.append(stake_tx_signed)
 
         return (block, block_sig_key)
@@ -115,19 +69,18 @@ class EconomyTest(BitcoinTestFramework):
         node0.wait_for_verack()
 
         staking_prevouts = []
-        blocks = []
 
-        for i in range(self.nodes[0].getblockcount()):
-            blocks.append(self.nodes[0].getblock(self.nodes[0].getblockhash(i)))
+        block_hashes = self.nodes[0].batch([["getblockhash", i] for i in range(self.nodes[0].getblockcount() + 1)])
+        blocks = self.nodes[0].batch([["getblock", block_hash] for block_hash in block_hashes])
 
-        for unspent in self.nodes[0].listunspent():
-            for block in blocks:
-                if unspent['txid'] in block['tx']:
-                    tx_block_time = block['time']
-                    break
+        txid_to_time = {}
+        for block in blocks:
+            for txid in block['tx']:
+                txid_to_time[txid] = block['time']
 
-            if unspent['confirmations'] > COINBASE_MATURITY:
-                staking_prevouts.append((COutPoint(int(unspent['txid'], 16), unspent['vout']), int(unspent['amount'])*COIN, tx_block_time))
+        for unspent in self.nodes[0].listunspent(COINBASE_MATURITY + 1):
+            tx_block_time = txid_to_time[unspent['txid']]
+            staking_prevouts.append((COutPoint(int(unspent['txid'], 16), unspent['vout']), int(unspent['amount'])*COIN, tx_block_time))
 
         bytecode = "6080604052348015600f57600080fd5b50336000806101000a81548173ffffffffffffffffffffffffffffffffffffffff021916908373ffffffffffffffffffffffffffffffffffffffff160217905550603580605d6000396000f3006080604052600080fd00a165627a7a723058200da151a481692b31bb57ba8af1190a8a4ab6f8a7543d188bcac01516e57550b80029"
 
@@ -141,7 +94,8 @@ class EconomyTest(BitcoinTestFramework):
         addcontract_tx.rehash()
 
         t = int(time.time()) & 0xfffffff0
-        (block, block_sig_key) = self.create_unsigned_pos_block(staking_prevouts[1:], t)
+        tip = self.nodes[0].getblock(self.nodes[0].getbestblockhash())
+        (block, block_sig_key) = self.create_unsigned_pos_block(staking_prevouts[1:], t, tip)
         block.vtx.extend([addcontract_tx])
 
         # Add the witness commitment to the coinbase,
@@ -45,10 +45,7 @@ class QtumPOSTest(ComparisonTestFramework):
         f = io.BytesIO(hex_str_to_bytes(parent_block_raw_hex))
         parent_block = CBlock()
         parent_block.deserialize(f)
-        coinbase = create_coinbase(block_height+1)
-        coinbase.vout[0].nValue = 0
-        coinbase.vout[0].scriptPubKey = b""
-        coinbase.rehash()
+        coinbase = make_empty_pos_coinbase(block_height+1)
         block = create_block(int(bestBlockHash, 16), coinbase, nTime)
         block.hashPrevBlock = int(bestBlockHash, 16)
         if not block.solve_stake(parent_block_stake_modifier, staking_prevouts):
@@ -42,10 +42,7 @@ class QtumHeaderSpamTest(BitcoinTestFramework):
             nTime = current_time & 0xfffffff0
 
         parent_block_stake_modifier = int(tip['modifier'], 16)
-        coinbase = create_coinbase(tip['height']+1)
-        coinbase.vout[0].nValue = 0
-        coinbase.vout[0].scriptPubKey = b""
-        coinbase.rehash()
+        coinbase = make_empty_pos_coinbase(tip['height']+1)
         block = create_block(int(tip['hash'], 16), coinbase, nTime)
         block.hashStateRoot = int(tip['hashStateRoot'], 16)
         block.hashUTXORoot = int(tip['hashUTXORoot'], 16)
@@ -88,6 +88,16 @@ def create_coinbase(height, pubkey = None):
     coinbase.calc_sha256()
     return coinbase
 
+# Create a coinbase transaction for a PoS block, whose reward is paid by the
+# coinstake: a single zero-value output with an empty scriptPubKey.
+def make_empty_pos_coinbase(height):
+    coinbase = CTransaction()
+    coinbase.vin.append(CTxIn(COutPoint(0, 0xffffffff),
+                CScript() + height + b"\x00", 0xffffffff)) #Fix for BIP34
+    coinbase.vout = [ CTxOut(0, b"") ]
+    coinbase.calc_sha256()
+    return coinbase
+
 # Create a transaction.
 # If the scriptPubKey is not specified, make it anyone-can-spend.
 def create_transaction(prevtx, n, sig, value, scriptPubKey=CScript()):
@@ -52,6 +52,21 @@ class AuthServiceProxyWrapper(object):
 
         return return_val
 
+    def _batch(self, rpc_call_list):
+        """
+        Delegates a JSON-RPC batch to AuthServiceProxy, then writes each RPC
+        method in the batch to a file.
+
+        """
+        return_val = self.auth_service_proxy_instance._batch(rpc_call_list)
+
+        if self.coverage_logfile:
+            with open(self.coverage_logfile, 'a+', encoding='utf8') as f:
+                for rpc_call in rpc_call_list:
+                    f.write("%s\n" % rpc_call['method'])
+
+        return return_val
+
     @property
     def url(self):
         return self.auth_service_proxy_instance.url
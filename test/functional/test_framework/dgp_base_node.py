@@ -0,0 +1,39 @@
+#!/usr/bin/env python3
+# Copyright (c) 2018 The LockTrip developers
+# Distributed under the MIT software license, see the accompanying
+# file COPYING or http://www.opensource.org/licenses/mit-license.php.
+"""P2P test node shared by the HYDRA DGP and economy functional tests."""
+
+from .mininode import NodeConnCB
+
+# NodeConnCB is a class containing callbacks to be executed when a P2P
+# message is received from the node-under-test. Subclass NodeConnCB and
+# override the on_*() methods if you need custom behaviour.
+class BaseNode(NodeConnCB):
+    def __init__(self):
+        """Initialize the NodeConnCB
+
+        Used to inialize custom properties for the Node that aren't
+        included by default in the base class. Be aware that the NodeConnCB
+        base class already stores a counter for each P2P message type and the
+        last received message of each type, which should be sufficient for the
+        needs of most tests.
+
+        Call super().__init__() first for standard initialization and then
+        initialize custom properties."""
+        super().__init__()
+        # Stores a dictionary of all blocks received
+        self.block_receive_map = {}
+
+    def on_block(self, conn, message):
+        """Override the standard on_block callback
+
+        Store the hash of a received block in the dictionary."""
+        block = message.block
+        block.calc_sha256()
+        m = self.block_receive_map
+        m[block.sha256] = m.get(block.sha256, 0) + 1
+
+    def on_inv(self, conn, message):
+        """Override the standard on_inv callback"""
+        pass
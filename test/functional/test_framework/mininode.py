@@ -117,20 +117,14 @@ def deser_uint256(f):
     return r
 
 
+UINT256_MASK = (1 << 256) - 1
+
 def ser_uint256(u):
-    rs = b""
-    for i in range(8):
-        rs += struct.pack("<I", u & 0xFFFFFFFF)
-        u >>= 32
-    return rs
+    return (u & UINT256_MASK).to_bytes(32, 'little')
 
 
 def uint256_from_str(s):
-    r = 0
-    t = struct.unpack("<IIIIIIII", s[:32])
-    for i in range(8):
-        r += t[i] << (i * 32)
-    return r
+    return int.from_bytes(s[:32], 'little')
 
 
 def uint256_from_compact(c):
@@ -209,6 +203,21 @@ def ser_int_vector(l):
         r += struct.pack("<i", i)
     return r
 
+# Return the index of the first (prevout, nValue, txBlockTime) entry whose
+# PoS kernel hash meets the nBits target at nTime, or None if none does.
+def find_stake_kernel(stakeModifier, prevouts, nTime, nBits):
+    # Compare each kernel hash as big-endian bytes against the target, which
+    # orders the same way as the integers without converting every hash.
+    target = min(uint256_from_compact(nBits), UINT256_MASK).to_bytes(32, 'big')
+    # The modifier and nTime are the same for every candidate
+    modifier = ser_uint256(stakeModifier)
+    nTime_bytes = struct.pack("<I", nTime)
+    for i, (prevout, nValue, txBlockTime) in enumerate(prevouts):
+        data = modifier + struct.pack("<I", txBlockTime) + prevout.serialize() + nTime_bytes
+        if hash256(data)[::-1] <= target:
+            return i
+    return None
+
 # Deserialize from a hex string representation (eg from RPC)
 def FromHex(obj, hex_string):
     obj.deserialize(BytesIO(hex_str_to_bytes(hex_string)))
@@ -512,8 +521,13 @@ class CTransaction(object):
             return uint256_from_str(hash256(self.serialize_with_witness()))
 
         if self.sha256 is None:
-            self.sha256 = uint256_from_str(hash256(self.serialize_without_witness()))
-        self.hash = encode(hash256(self.serialize())[::-1], 'hex_codec').decode('ascii')
+            h = hash256(self.serialize_without_witness())
+            self.sha256 = uint256_from_str(h)
+            self.hash = encode(h[::-1], 'hex_codec').decode('ascii')
+        else:
+            # Keep refreshing self.hash, callers may read it after mutating
+            # the transaction without calling rehash()
+            self.hash = encode(hash256(self.serialize())[::-1], 'hex_codec').decode('ascii')
 
     def is_valid(self):
         self.calc_sha256()
@@ -594,19 +608,10 @@ class CBlockHeader(object):
 
     def calc_sha256(self):
         if self.sha256 is None:
-            r = b""
-            r += struct.pack("<i", self.nVersion)
-            r += ser_uint256(self.hashPrevBlock)
-            r += ser_uint256(self.hashMerkleRoot)
-            r += struct.pack("<I", self.nTime)
-            r += struct.pack("<I", self.nBits)
-            r += struct.pack("<I", self.nNonce)
-            r += ser_uint256(self.hashStateRoot)
-            r += ser_uint256(self.hashUTXORoot)
-            r += self.prevoutStake.serialize() if self.prevoutStake else COutPoint(0, 0xffffffff).serialize()
-            r += ser_string(self.vchBlockSig)
-            self.sha256 = uint256_from_str(hash256(r))
-            self.hash = encode(hash256(r)[::-1], 'hex_codec').decode('ascii')
+            # Only the header is hashed, even when self is a CBlock
+            h = hash256(CBlockHeader.serialize(self))
+            self.sha256 = uint256_from_str(h)
+            self.hash = encode(h[::-1], 'hex_codec').decode('ascii')
 
     def rehash(self):
         self.sha256 = None
@@ -617,18 +622,11 @@ class CBlockHeader(object):
         return self.prevoutStake and (self.prevoutStake.hash != 0 or self.prevoutStake.n != 0xffffffff)
 
     def solve_stake(self, stakeModifier, prevouts):
-        target = uint256_from_compact(self.nBits)
-        for prevout, nValue, txBlockTime in prevouts:
-            data = b""
-            data += ser_uint256(stakeModifier)
-            data += struct.pack("<I", txBlockTime)
-            data += prevout.serialize()
-            data += struct.pack("<I", self.nTime)
-            posHash = uint256_from_str(hash256(data))
-            if posHash <= target:
-                self.prevoutStake = prevout
-                return True
-        return False
+        index = find_stake_kernel(stakeModifier, prevouts, self.nTime, self.nBits)
+        if index is None:
+            return False
+        self.prevoutStake = prevouts[index][0]
+        return True
 
     def __repr__(self):
         return "CBlockHeader(nVersion=%i hashPrevBlock=%064x hashMerkleRoot=%064x nTime=%s nBits=%08x nNonce=%08x)" \
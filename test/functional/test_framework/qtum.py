@@ -7,6 +7,26 @@ from .blocktools import *
 from .key import *
 import io
 
+# Encodes n as a 32 byte ABI uint256 word
+def abi_uint(n):
+    return "%064x" % n
+
+# Callstring setting the initial main and backup admins of the DGP and oracle contracts
+def dgp_init_admin_callstring(main_address_eth, backup_address_eth):
+    return "7fd05e2a" + main_address_eth.rjust(64, "0") + backup_address_eth.rjust(64, "0")
+
+_fixed_block_sig_key = None
+
+# Returns the (key, scriptPubKey) block signing pair derived from a fixed secret,
+# deriving it on first use only
+def fixed_block_sig_key():
+    global _fixed_block_sig_key
+    if _fixed_block_sig_key is None:
+        block_sig_key = CECKey()
+        block_sig_key.set_secretbytes(hash256(struct.pack('<I', 0xffff)))
+        _fixed_block_sig_key = (block_sig_key, CScript([block_sig_key.get_pubkey(), OP_CHECKSIG]))
+    return _fixed_block_sig_key
+
 def make_transaction(node, vin, vout):
     tx = CTransaction()
     tx.vin = vin
@@ -65,6 +85,12 @@ def p2pkh_to_hex_hash(address):
 def hex_hash_to_p2pkh(hex_hash):
     return keyhash_to_p2pkh(hex_str_to_bytes(hex_hash))    
 
+# Returns count (address, hexaddress) pairs using two batched RPC requests
+def new_hex_pairs(node, count):
+    addresses = node.batch([["getnewaddress"]] * count)
+    hex_addresses = node.batch([["gethexaddress", address] for address in addresses])
+    return list(zip(addresses, hex_addresses))
+
 def assert_vin(tx, expected_vin):
     assert_equal(len(tx['vin']), len(expected_vin))
     matches = []
@@ -109,12 +135,12 @@ def make_vin_from_unspent(node, unspents=None, value=INITIAL_BLOCK_REWARD, addre
 def read_evm_array(node, address, abi, ignore_nulls=True):
     arr = []
     index = 0
-    ret = node.callcontract(address, abi + hex(index)[2:].zfill(64))
+    ret = node.callcontract(address, abi + abi_uint(index))
     while ret['executionResult']['excepted'] == 'None':
         if int(ret['executionResult']['output'], 16) != 0 or not ignore_nulls:
             arr.append(ret['executionResult']['output'])
         index += 1
-        ret = node.callcontract(address, abi + hex(index)[2:].zfill(64))
+        ret = node.callcontract(address, abi + abi_uint(index))
     return arr
 
 class DGPState:
@@ -166,15 +192,15 @@ class DGPState:
 
     def send_add_address_proposal(self, proposal_address, type1, sender):
         self.node.sendtoaddress(sender, 1)
-        self.node.sendtocontract(self.contract_address, self.abiAddAddressProposal + proposal_address.zfill(64) + hex(type1)[2:].zfill(64), 0, 2000000, QTUM_MIN_GAS_PRICE_STR, sender)
+        self.node.sendtocontract(self.contract_address, self.abiAddAddressProposal + proposal_address.zfill(64) + abi_uint(type1), 0, 2000000, QTUM_MIN_GAS_PRICE_STR, sender)
 
     def send_remove_address_proposal(self, proposal_address, type1, sender):
         self.node.sendtoaddress(sender, 1)
-        self.node.sendtocontract(self.contract_address, self.abiRemoveAddressProposal + proposal_address.zfill(64) + hex(type1)[2:].zfill(64), 0, 2000000, QTUM_MIN_GAS_PRICE_STR, sender)
+        self.node.sendtocontract(self.contract_address, self.abiRemoveAddressProposal + proposal_address.zfill(64) + abi_uint(type1), 0, 2000000, QTUM_MIN_GAS_PRICE_STR, sender)
 
     def send_change_value_proposal(self, uint_proposal, type1, sender):
         self.node.sendtoaddress(sender, 1)
-        self.node.sendtocontract(self.contract_address, self.abiChangeValueProposal + hex(uint_proposal)[2:].zfill(64) + hex(type1)[2:].zfill(64), 0, 2000000, QTUM_MIN_GAS_PRICE_STR, sender)
+        self.node.sendtocontract(self.contract_address, self.abiChangeValueProposal + abi_uint(uint_proposal) + abi_uint(type1), 0, 2000000, QTUM_MIN_GAS_PRICE_STR, sender)
 
     def assert_state(self):
         # This assertion is only to catch potential errors in the test code (if we forget to add a generate after an evm call)
@@ -188,10 +214,10 @@ class DGPState:
             self._assert_params_for_block(block_height, param_for_block)
         # Make sure that there are no subsequent params for blocks
         if self.params_for_block:
-            ret = self.node.callcontract(self.contract_address, self.abiGetParamsForBlock + hex(0x2fff)[2:].zfill(64))
+            ret = self.node.callcontract(self.contract_address, self.abiGetParamsForBlock + abi_uint(0x2fff))
             assert_equal(int(ret['executionResult']['output'], 16), int(param_for_block, 16))
         else:
-            ret = self.node.callcontract(self.contract_address, self.abiGetParamsForBlock + hex(0x2fff)[2:].zfill(64))
+            ret = self.node.callcontract(self.contract_address, self.abiGetParamsForBlock + abi_uint(0x2fff))
             assert_equal(int(ret['executionResult']['output'], 16), 0)
 
 
@@ -199,10 +225,10 @@ class DGPState:
             self._assert_param_address_at_index(index, param_address_at_index)
         # Make sure that there are no subsequent params at the next index
         if self.param_address_at_indices:
-            ret = self.node.callcontract(self.contract_address, self.abiGetParamAddressAtIndex + hex(index+1)[2:].zfill(64))
+            ret = self.node.callcontract(self.contract_address, self.abiGetParamAddressAtIndex + abi_uint(index+1))
             assert(ret['executionResult']['excepted'] != 'None')
         else:
-            ret = self.node.callcontract(self.contract_address, self.abiGetParamAddressAtIndex + hex(0x0)[2:].zfill(64))
+            ret = self.node.callcontract(self.contract_address, self.abiGetParamAddressAtIndex + abi_uint(0x0))
             assert(ret['executionResult']['excepted'] != 'None')
 
 
@@ -265,7 +291,7 @@ class DGPState:
     }
     """
     def _assert_current_on_vote_address_proposal(self, type1, type2, expected_address):
-        ret = self.node.callcontract(self.contract_address, self.abiGetCurrentOnVoteAddressProposal + hex(type1)[2:].zfill(64) + hex(type2)[2:].zfill(64))
+        ret = self.node.callcontract(self.contract_address, self.abiGetCurrentOnVoteAddressProposal + abi_uint(type1) + abi_uint(type2))
         assert_equal(int(ret['executionResult']['output'], 16), int(expected_address, 16))
 
     """
@@ -279,7 +305,7 @@ class DGPState:
     }
     """
     def _assert_current_on_vote_value_proposal(self, type1, expected_proposal):
-        ret = self.node.callcontract(self.contract_address, self.abiGetCurrentOnVoteValueProposal + hex(type1)[2:].zfill(64))
+        ret = self.node.callcontract(self.contract_address, self.abiGetCurrentOnVoteValueProposal + abi_uint(type1))
         assert_equal(int(ret['executionResult']['output'], 16), expected_proposal)
 
     """
@@ -293,7 +319,7 @@ class DGPState:
     }
     """
     def _assert_params_for_block(self, required_block_height, expected_param_address):
-        ret = self.node.callcontract(self.contract_address, self.abiGetParamsForBlock + hex(required_block_height)[2:].zfill(64))
+        ret = self.node.callcontract(self.contract_address, self.abiGetParamsForBlock + abi_uint(required_block_height))
         assert_equal(int(ret['executionResult']['output'], 16), int(expected_param_address, 16))
 
     """
@@ -302,7 +328,7 @@ class DGPState:
     }
     """
     def _assert_param_address_at_index(self, param_index, expected_param_address):
-        ret = self.node.callcontract(self.contract_address, self.abiGetParamAddressAtIndex + hex(param_index)[2:].zfill(64))
+        ret = self.node.callcontract(self.contract_address, self.abiGetParamAddressAtIndex + abi_uint(param_index))
         assert_equal(int(ret['executionResult']['output'], 16), int(expected_param_address, 16))
 
 
@@ -312,7 +338,7 @@ class DGPState:
     }
     """
     def _assert_param_block_height_at_index(self, param_index, expected_block_height):
-        ret = self.node.callcontract(self.contract_address, self.abiGetParamHeightAtIndex + hex(param_index)[2:].zfill(64))
+        ret = self.node.callcontract(self.contract_address, self.abiGetParamHeightAtIndex + abi_uint(param_index))
         assert_equal(int(ret['executionResult']['output'], 16), expected_block_height)
 
     """
@@ -367,10 +393,7 @@ def create_unsigned_pos_block(node, staking_prevouts, nTime=None, nCounter=0):
 
     #print('node.getbestblockhash node=%s' % (tip))
     parent_block_stake_modifier = int(tip['modifier'], 16)
-    coinbase = create_coinbase(tip['height']+1)
-    coinbase.vout[0].nValue = 0
-    coinbase.vout[0].scriptPubKey = b""
-    coinbase.rehash()
+    coinbase = make_empty_pos_coinbase(tip['height']+1)
     block = create_block(int(tip['hash'], 16), coinbase, nTime, nCounter=nCounter)
     block.hashStateRoot = int(tip['hashStateRoot'], 16)
     block.hashUTXORoot = int(tip['hashUTXORoot'], 16)
@@ -108,6 +108,22 @@ class TestNode():
             time.sleep(1.0 / poll_per_s)
         raise AssertionError("Unable to connect to bitcoind")
 
+    def batch(self, requests):
+        """Send a list of [method, *params] calls as one JSON-RPC batch.
+
+        Returns the results in the same order as the requests. Raises
+        JSONRPCException for the first call that returned an error."""
+        assert self.rpc_connected and self.rpc is not None, "Error: no RPC connection"
+        rpc_call_list = [{'version': '1.1', 'method': request[0], 'params': list(request[1:]), 'id': i}
+                         for i, request in enumerate(requests)]
+        if not rpc_call_list:
+            return []
+        responses = sorted(self.rpc._batch(rpc_call_list), key=lambda response: response['id'])
+        for response in responses:
+            if response['error'] is not None:
+                raise JSONRPCException(response['error'])
+        return [response['result'] for response in responses]
+
     def get_wallet_rpc(self, wallet_name):
         assert self.rpc_connected
         assert self.rpc
@@ -5,7 +5,6 @@
 """Helpful routines for regression testing."""
 
 from base64 import b64encode
-from binascii import hexlify, unhexlify
 from decimal import Decimal, ROUND_DOWN
 import hashlib
 import json
@@ -184,7 +183,7 @@ def count_bytes(hex_string):
     return len(bytearray.fromhex(hex_string))
 
 def bytes_to_hex_str(byte_str):
-    return hexlify(byte_str).decode('ascii')
+    return byte_str.hex()
 
 def hash256(byte_str):
     sha256 = hashlib.sha256()
@@ -194,7 +193,7 @@ def hash256(byte_str):
     return sha256d.digest()[::-1]
 
 def hex_str_to_bytes(hex_str):
-    return unhexlify(hex_str.encode('ascii'))
+    return bytes.fromhex(hex_str)
 
 def str_to_b64str(string):
     return b64encode(string.encode('utf-8')).decode('ascii')